@@ -0,0 +1,374 @@
+"""Benchmarks de carga e micro-benchmarks da API Flask (app.py).
+
+Cria um banco com dados sintéticos (contratos, eventos, turmas, alunos, fotos e etiquetas),
+troca o cliente Supabase por um stub e o storage por um diretório temporário, e mede:
+
+- rotas: cliente_galeria, admin_etiquetagem, etiquetar_fotos, register_client e upload_fotos,
+  disparadas em paralelo pelo test client do Flask (latência p50/p95/p99 e consultas SQL
+  por requisição, lidas do cabeçalho X-Query-Count);
+- funções: montar_galeria_cliente, etiquetas_por_foto, buscar_alunos_do_evento e hash_password.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/benchmark_api.py --salvar-baseline benchmarks/baseline.json
+    python benchmarks/benchmark_api.py --comparar benchmarks/baseline.json --limite-regressao 0.2
+
+Por padrão usa um SQLite temporário; com --database-url usa, por exemplo, um Postgres local
+(o banco precisa estar vazio: o schema é criado pelas migrações). Com --comparar, termina com
+código 1 se o p95 ou a média de consultas de algum cenário piorar além do limite.
+"""
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import click
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'tests')) # stub_supabase, compartilhado com os testes
+from stub_supabase import instalar_stub_supabase
+
+
+class _ConsultaStub:
+    """Consulta PostgREST fictícia: aceita qualquer encadeamento e retorna vazio."""
+
+    def __getattr__(self, nome):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return types.SimpleNamespace(data=[])
+
+
+class SupabaseStub:
+    """Substitui o cliente Supabase: as rotas medidas não dependem de dados do Supabase."""
+
+    def __init__(self, url=None, key=None):
+        self.supabase_url = url
+
+    def from_(self, tabela):
+        return _ConsultaStub()
+
+    table = from_
+
+
+def carregar_app(database_url, storage_dir):
+    """Importa app.py apontando para o banco de benchmark, com o Supabase e o storage substituídos."""
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['LOCAL_STORAGE_DIR'] = storage_dir
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('SUPABASE_URL', 'http://supabase.benchmark')
+    os.environ.setdefault('SLOW_QUERY_MS', '5000') # o povoamento em massa não deve encher o log de consultas lentas
+    os.environ.pop('CACHE_REDIS_URL', None)
+
+    instalar_stub_supabase(SupabaseStub)
+
+    sys.path.insert(0, RAIZ)
+    import app as app_module
+    return app_module
+
+
+def popular_banco(m, contratos, turmas_por_evento, alunos_por_turma, fotos, etiquetas_por_foto):
+    """Dados sintéticos via INSERTs em massa. Retorna os IDs usados para montar as requisições."""
+    from sqlalchemy import insert, func, select
+
+    db = m.db
+    if db.session.scalar(select(func.count()).select_from(m.Evento)):
+        raise click.ClickException("O banco de benchmark precisa estar vazio.")
+
+    plano = m.Plano(nome='Plano Benchmark', preco=100)
+    db.session.add(plano)
+    db.session.flush()
+
+    eventos = []
+    familias = [] # (user_id, [aluno_ids], evento_id)
+    for c in range(contratos):
+        contrato = m.Contrato(id=str(uuid.uuid4()), nome=f'Escola {c}', token_convite=str(uuid.uuid4()))
+        evento = m.Evento(id=str(uuid.uuid4()), nome=f'Formatura {c}', data=date.today(), contrato_id=contrato.id)
+        db.session.add_all([contrato, evento])
+        db.session.flush()
+        db.session.execute(insert(m.contrato_plano_association), [{"contrato_id": contrato.id, "plano_id": plano.id}])
+        eventos.append({"id": evento.id, "contrato": contrato, "turmas": {}})
+
+        turma_ids = db.session.scalars(insert(m.Turma).returning(m.Turma.id), [
+            {"nome": f"Turma {t}", "evento_id": evento.id} for t in range(turmas_por_evento)
+        ]).all()
+        total_alunos = turmas_por_evento * alunos_por_turma
+        # ~1,3 filhos por família
+        total_familias = max(1, int(total_alunos / 1.3))
+        user_ids = db.session.scalars(insert(m.User).returning(m.User.id), [{
+            "email": f"familia-{c}-{f}@benchmark.local",
+            "password_hash": "!benchmark",
+            "cpf": f"{c:02d}{f:09d}"
+        } for f in range(total_familias)]).all()
+        db.session.execute(insert(m.Assinatura), [
+            {"user_id": user_id, "plano_id": plano.id, "data_assinatura": datetime.utcnow()} for user_id in user_ids
+        ])
+        alunos = [{
+            "nome": f"Aluno {c}-{a}",
+            "user_id": user_ids[a % total_familias],
+            "turma_id": turma_ids[a // alunos_por_turma]
+        } for a in range(total_alunos)]
+        aluno_ids = db.session.scalars(insert(m.Aluno).returning(m.Aluno.id), alunos).all()
+
+        por_familia = {}
+        for aluno_id, aluno in zip(aluno_ids, alunos):
+            por_familia.setdefault(aluno["user_id"], []).append(aluno_id)
+            eventos[-1]["turmas"].setdefault(aluno["turma_id"], []).append(aluno_id)
+        familias.extend((user_id, ids, evento.id) for user_id, ids in por_familia.items())
+        db.session.commit()
+
+    # Fotos distribuídas entre os eventos; cada foto etiquetada com alunos de uma mesma turma
+    # (média de `etiquetas_por_foto`, ~20% sem etiqueta)
+    fotos_por_evento = {}
+    for i, evento in enumerate(eventos):
+        quantidade = fotos // len(eventos) + (1 if i < fotos % len(eventos) else 0)
+        foto_ids = []
+        for inicio in range(0, quantidade, 10000):
+            foto_ids += db.session.scalars(insert(m.Foto).returning(m.Foto.id), [{
+                "caminho": f"{evento['id']}/{uuid.uuid4()}.jpg",
+                "phash": random.getrandbits(64) - (1 << 63), # o upload carrega os hashes do evento
+                "evento_id": evento["id"]
+            } for _ in range(inicio, min(quantidade, inicio + 10000))]).all()
+        turmas = list(evento["turmas"].values())
+        etiquetas = []
+        for foto_id in foto_ids:
+            if random.random() < 0.2:
+                continue
+            turma = random.choice(turmas)
+            quantos = min(len(turma), max(1, int(random.expovariate(1 / etiquetas_por_foto)) + 1))
+            etiquetas += [{"foto_id": foto_id, "aluno_id": aluno_id} for aluno_id in random.sample(turma, quantos)]
+        for inicio in range(0, len(etiquetas), 20000):
+            db.session.execute(insert(m.foto_aluno_association), etiquetas[inicio:inicio + 20000])
+        db.session.commit()
+        fotos_por_evento[evento["id"]] = foto_ids
+
+    return {
+        "eventos": [e["id"] for e in eventos],
+        "alunos_por_evento": {e["id"]: [a for ids in e["turmas"].values() for a in ids] for e in eventos},
+        "familias": familias,
+        "fotos_por_evento": fotos_por_evento,
+        "token_convite": eventos[0]["contrato"].token_convite,
+        "plano_id": plano.id,
+    }
+
+
+def _imagem_jpeg():
+    try:
+        from PIL import Image
+    except ImportError:
+        return b'\xff\xd8\xff\xe0' + os.urandom(200 * 1024) # sem Pillow os derivados não são gerados
+    buffer = io.BytesIO()
+    Image.effect_noise((1600, 1200), 64).convert('RGB').save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def montar_cenarios(dados, arquivos_por_upload):
+    """Cada cenário recebe um test client e executa uma requisição, retornando a resposta."""
+    jpeg = _imagem_jpeg()
+
+    def cliente_galeria(client):
+        user_id, _, evento_id = random.choice(dados["familias"])
+        with client.session_transaction() as sessao:
+            sessao['user_id'] = user_id
+        return client.get(f'/dashboard/evento/{evento_id}')
+
+    def admin_etiquetagem(client):
+        return client.get(f'/admin/evento/{random.choice(dados["eventos"])}/etiquetar')
+
+    def etiquetar_fotos(client):
+        evento_id = random.choice(dados["eventos"])
+        return client.post('/api/fotos/etiquetar', json={
+            "foto_ids": random.sample(dados["fotos_por_evento"][evento_id], 50),
+            "aluno_ids": random.sample(dados["alunos_por_evento"][evento_id], 2),
+            "action": random.choice(['add', 'remove'])
+        })
+
+    def register_client(client):
+        sufixo = uuid.uuid4().hex
+        return client.post('/api/register', json={
+            "contractSlug": dados["token_convite"],
+            "cpf": sufixo[:11],
+            "parentName": "Responsável Benchmark",
+            "phone": "11999999999",
+            "parentEmail": f"{sufixo}@benchmark.local",
+            "password": "senha-benchmark",
+            "selectedPlan": dados["plano_id"],
+            "children": [{"name": "Filho Benchmark", "dob": "01/02/2015", "school": "Escola", "class": "5A", "shift": "Manhã"}]
+        })
+
+    def upload_fotos(client):
+        arquivos = [(io.BytesIO(jpeg), f'foto-{i}.jpg') for i in range(arquivos_por_upload)]
+        return client.post(
+            f'/admin/evento/{random.choice(dados["eventos"])}/upload-fotos',
+            data={'files[]': arquivos}, content_type='multipart/form-data'
+        )
+
+    return {
+        'cliente_galeria': cliente_galeria,
+        'admin_etiquetagem': admin_etiquetagem,
+        'etiquetar_fotos': etiquetar_fotos,
+        'register_client': register_client,
+        'upload_fotos': upload_fotos,
+    }
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def _resumo(latencias_ms, consultas, erros):
+    return {
+        "requisicoes": len(latencias_ms),
+        "erros": erros,
+        "p50_ms": round(_percentil(latencias_ms, 50), 2),
+        "p95_ms": round(_percentil(latencias_ms, 95), 2),
+        "p99_ms": round(_percentil(latencias_ms, 99), 2),
+        "consultas_media": round(sum(consultas) / len(consultas), 2) if consultas else None,
+        "consultas_max": max(consultas) if consultas else None,
+    }
+
+
+def executar_cenario(app, executar, requisicoes, concorrencia):
+    clientes = {}
+
+    def uma_requisicao(_):
+        # Um test client por thread (cada um mantém a própria sessão)
+        client = clientes.setdefault(threading.get_ident(), app.test_client())
+        inicio = time.perf_counter()
+        resposta = executar(client)
+        duracao = (time.perf_counter() - inicio) * 1000
+        consultas = resposta.headers.get('X-Query-Count')
+        return duracao, int(consultas) if consultas is not None else None, resposta.status_code >= 400
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        resultados = list(executor.map(uma_requisicao, range(requisicoes)))
+    return _resumo(
+        [duracao for duracao, _, _ in resultados],
+        [consultas for _, consultas, _ in resultados if consultas is not None],
+        sum(1 for _, _, erro in resultados if erro)
+    )
+
+
+def executar_micro(m, dados, repeticoes):
+    evento_id = dados["eventos"][0]
+    familias = [f for f in dados["familias"] if f[2] == evento_id]
+    fotos = dados["fotos_por_evento"][evento_id]
+    micro = {
+        'montar_galeria_cliente': lambda: m.montar_galeria_cliente(evento_id, random.choice(familias)[1]),
+        'etiquetas_por_foto': lambda: m.etiquetas_por_foto(evento_id, random.sample(fotos, 100)),
+        'buscar_alunos_do_evento': lambda: m.buscar_alunos_do_evento(evento_id, f"aluno 0-{random.randrange(100)}", 20),
+        'hash_password': lambda: m.hash_password('senha-benchmark'),
+    }
+    resultados = {}
+    for nome, funcao in micro.items():
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        m.db.session.rollback()
+        resultados[nome] = _resumo(tempos, [], 0)
+    return resultados
+
+
+def comparar_com_baseline(resultados, baseline, limite):
+    """Lista as regressões além de `limite` (fração) no p95 e na média de consultas."""
+    regressoes = []
+    for grupo in ('cenarios', 'micro'):
+        for nome, atual in resultados.get(grupo, {}).items():
+            anterior = baseline.get(grupo, {}).get(nome)
+            if not anterior:
+                continue
+            if atual["p95_ms"] > anterior["p95_ms"] * (1 + limite):
+                regressoes.append(f"{nome}: p95 {anterior['p95_ms']} ms -> {atual['p95_ms']} ms")
+            if anterior.get("consultas_media") is not None and atual.get("consultas_media") is not None \
+                    and atual["consultas_media"] > anterior["consultas_media"] * (1 + limite) + 0.5:
+                regressoes.append(f"{nome}: consultas {anterior['consultas_media']} -> {atual['consultas_media']}")
+            if atual["erros"] > anterior["erros"]:
+                regressoes.append(f"{nome}: erros {anterior['erros']} -> {atual['erros']}")
+    return regressoes
+
+
+@click.command()
+@click.option('--database-url', default=None, help='Banco de benchmark (padrão: SQLite temporário).')
+@click.option('--contratos', default=3, show_default=True)
+@click.option('--turmas-por-evento', default=40, show_default=True)
+@click.option('--alunos-por-turma', default=30, show_default=True)
+@click.option('--fotos', default=100000, show_default=True)
+@click.option('--etiquetas-por-foto', default=2.0, show_default=True, help='Média de alunos etiquetados por foto.')
+@click.option('--requisicoes', default=200, show_default=True, help='Requisições por cenário.')
+@click.option('--concorrencia', default=8, show_default=True)
+@click.option('--arquivos-por-upload', default=5, show_default=True)
+@click.option('--repeticoes-micro', default=50, show_default=True)
+@click.option('--cenario', 'somente', multiple=True, help='Executa apenas estes cenários.')
+@click.option('--seed', default=42, show_default=True)
+@click.option('--saida', type=click.Path(dir_okay=False), help='Grava os resultados em JSON.')
+@click.option('--salvar-baseline', type=click.Path(dir_okay=False), help='Grava os resultados como nova baseline.')
+@click.option('--comparar', type=click.Path(exists=True, dir_okay=False), help='Baseline para comparação.')
+@click.option('--limite-regressao', default=0.2, show_default=True, help='Piora máxima tolerada (fração).')
+def main(database_url, contratos, turmas_por_evento, alunos_por_turma, fotos, etiquetas_por_foto, requisicoes,
+         concorrencia, arquivos_por_upload, repeticoes_micro, somente, seed, saida, salvar_baseline, comparar,
+         limite_regressao):
+    random.seed(seed)
+    temporario = tempfile.mkdtemp(prefix='benchmark-api-')
+    database_url = database_url or f"sqlite:///{os.path.join(temporario, 'benchmark.db')}"
+    m = carregar_app(database_url, os.path.join(temporario, 'storage'))
+
+    with m.app.app_context():
+        m.upgrade(directory=os.path.join(RAIZ, 'migrations'))
+        inicio = time.perf_counter()
+        dados = popular_banco(m, contratos, turmas_por_evento, alunos_por_turma, fotos, etiquetas_por_foto)
+        click.echo(
+            f"Banco populado em {time.perf_counter() - inicio:.1f}s: {contratos} eventos, "
+            f"{sum(len(a) for a in dados['alunos_por_evento'].values())} alunos, {fotos} fotos ({m.db.engine.dialect.name})"
+        )
+
+    cenarios = montar_cenarios(dados, arquivos_por_upload)
+    resultados = {
+        "parametros": {
+            "dialeto": database_url.split(':', 1)[0], "contratos": contratos, "turmas_por_evento": turmas_por_evento,
+            "alunos_por_turma": alunos_por_turma, "fotos": fotos, "etiquetas_por_foto": etiquetas_por_foto,
+            "requisicoes": requisicoes, "concorrencia": concorrencia, "seed": seed
+        },
+        "cenarios": {},
+    }
+    for nome, executar in cenarios.items():
+        if somente and nome not in somente:
+            continue
+        resultados["cenarios"][nome] = resumo = executar_cenario(m.app, executar, requisicoes, concorrencia)
+        click.echo(
+            f"{nome}: p50 {resumo['p50_ms']} ms, p95 {resumo['p95_ms']} ms, p99 {resumo['p99_ms']} ms, "
+            f"consultas {resumo['consultas_media']} (máx. {resumo['consultas_max']}), erros {resumo['erros']}"
+        )
+
+    with m.app.app_context():
+        resultados["micro"] = executar_micro(m, dados, repeticoes_micro)
+    for nome, resumo in resultados["micro"].items():
+        click.echo(f"{nome}: p50 {resumo['p50_ms']} ms, p95 {resumo['p95_ms']} ms")
+
+    for caminho in filter(None, [saida, salvar_baseline]):
+        with open(caminho, 'w') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        click.echo(f"Resultados gravados em {caminho}")
+
+    if comparar:
+        with open(comparar) as arquivo:
+            regressoes = comparar_com_baseline(resultados, json.load(arquivo), limite_regressao)
+        if regressoes:
+            for regressao in regressoes:
+                click.echo(f"REGRESSÃO {regressao}", err=True)
+            sys.exit(1)
+        click.echo(f"Sem regressões acima de {limite_regressao:.0%} em relação a {comparar}")
+
+
+if __name__ == '__main__':
+    main()
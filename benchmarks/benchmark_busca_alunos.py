@@ -0,0 +1,95 @@
+"""Benchmark da busca de alunos do evento (buscar_alunos_do_evento, usada por /api/eventos/<id>/alunos/search).
+
+Cria um evento sintético com `--alunos` alunos em um banco de benchmark e mede a latência
+p50/p95 por tipo de consulta (prefixo do nome, trecho sem acento, nome e sobrenome, prefixo do CPF).
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/benchmark_busca_alunos.py --alunos 100000
+
+Por padrão usa um SQLite temporário; com --database-url usa, por exemplo, um Postgres local
+(o banco precisa estar vazio: o schema é criado pelas migrações). No SQLite não há índice de
+trigramas: os números de busca por nome só são representativos no Postgres.
+"""
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date
+
+import click
+
+from benchmark_api import RAIZ, carregar_app
+
+NOMES = ['Ana', 'Bruno', 'Cecília', 'Davi', 'Élise', 'Fábio', 'Gustavo', 'Helena', 'Íris', 'João', 'Lúcia', 'Márcio']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Araújo', 'Gonçalves', 'Conceição', 'Simões', 'Lima', 'Brandão', 'Pereira']
+
+
+def popular_evento(m, total):
+    """Um evento com `total` alunos (um responsável por aluno) em turmas de 30. Retorna (evento_id, turmas)."""
+    from sqlalchemy import insert, func, select
+
+    db = m.db
+    if db.session.scalar(select(func.count()).select_from(m.Evento)):
+        raise click.ClickException("O banco de benchmark precisa estar vazio.")
+
+    contrato = m.Contrato(id=str(uuid.uuid4()), nome='Escola Benchmark')
+    evento = m.Evento(id=str(uuid.uuid4()), nome='Formatura Benchmark', data=date.today(), contrato_id=contrato.id)
+    db.session.add_all([contrato, evento])
+    db.session.flush()
+    turma_ids = db.session.scalars(insert(m.Turma).returning(m.Turma.id), [
+        {"nome": f"Turma {i}", "evento_id": evento.id} for i in range(max(1, total // 30))
+    ]).all()
+    user_ids = db.session.scalars(insert(m.User).returning(m.User.id), [
+        {"email": f"familia-{i}@benchmark.local", "password_hash": "!benchmark", "cpf": f"9{i:010d}"[-11:]}
+        for i in range(total)
+    ]).all()
+    db.session.execute(insert(m.Aluno), [{
+        "nome": f"{random.choice(NOMES)} {random.choice(SOBRENOMES)} {random.choice(SOBRENOMES)}",
+        "user_id": user_id,
+        "turma_id": turma_ids[i % len(turma_ids)]
+    } for i, user_id in enumerate(user_ids)])
+    db.session.commit()
+    if db.engine.dialect.name == 'postgresql':
+        for tabela in ('aluno', '"user"', 'turma'):
+            db.session.execute(db.text(f'ANALYZE {tabela}'))
+        db.session.commit()
+    return evento.id, len(turma_ids)
+
+
+@click.command()
+@click.option('--database-url', default=None, help='Banco de benchmark (padrão: SQLite temporário).')
+@click.option('--alunos', 'total', default=100000, show_default=True, help='Alunos sintéticos no evento de teste.')
+@click.option('--consultas', default=200, show_default=True, help='Buscas medidas por tipo de consulta.')
+@click.option('--seed', default=42, show_default=True)
+def main(database_url, total, consultas, seed):
+    random.seed(seed)
+    temporario = tempfile.mkdtemp(prefix='benchmark-busca-alunos-')
+    database_url = database_url or f"sqlite:///{os.path.join(temporario, 'benchmark.db')}"
+    m = carregar_app(database_url, os.path.join(temporario, 'storage'))
+
+    with m.app.app_context():
+        m.upgrade(directory=os.path.join(RAIZ, 'migrations'))
+        evento_id, turmas = popular_evento(m, total)
+        click.echo(f"{total} alunos em {turmas} turmas ({m.db.engine.dialect.name})")
+
+        cenarios = {
+            'prefixo do nome': lambda: random.choice(NOMES)[:3],
+            'trecho sem acento': lambda: m.normalizar_busca(random.choice(SOBRENOMES))[2:6],
+            'nome e sobrenome': lambda: f"{random.choice(NOMES)} {random.choice(SOBRENOMES)}",
+            'prefixo do CPF': lambda: f"9{random.randrange(total):010d}"[-11:][:6],
+        }
+        for cenario, gerar in cenarios.items():
+            tempos = []
+            for _ in range(consultas):
+                q = gerar()
+                inicio = time.perf_counter()
+                m.buscar_alunos_do_evento(evento_id, q, m.ALUNOS_PAGE_SIZE)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+            tempos.sort()
+            click.echo(f"{cenario}: p50 {tempos[len(tempos) // 2]:.1f} ms, p95 {tempos[int(len(tempos) * 0.95)]:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# Configuração de produção: gunicorn -c gunicorn.conf.py
+#
+# Cada worker tem seu próprio pool de conexões (DB_POOL_SIZE + DB_MAX_OVERFLOW, ver app.py),
+# então o total de conexões com o banco é workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+# Mantenha esse número abaixo do limite do Postgres/pooler; atrás de pgbouncer/Supavisor
+# em transaction mode, use DB_PGBOUNCER=1.
+#
+# Com mais de um worker, CACHE_REDIS_URL é obrigatória (ver on_starting).
+import multiprocessing
+import os
+
+wsgi_app = 'app:create_app(preparar=False)'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# As rotas passam a maior parte do tempo esperando o banco e o Supabase: poucos processos
+# com várias threads cada. O processamento de imagens já usa um pool de processos por worker
+# (DERIVATIVE_WORKERS), por isso não escalamos workers por 2 x núcleos + 1.
+workers = int(os.getenv('GUNICORN_WORKERS', str(max(2, multiprocessing.cpu_count()))))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120')) # Uploads grandes
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """Migrações e jobs interrompidos: uma vez, no master, antes dos workers.
+
+    Com mais de um worker, recusa iniciar sem os caches no Redis (CACHE_REDIS_URL): caches em
+    memória são por processo e a invalidação feita em um worker não chegaria aos outros.
+    """
+    from app import preparar_banco, verificar_caches_compartilhados
+    verificar_caches_compartilhados(server.cfg.workers)
+    preparar_banco()
+
+
+def worker_exit(server, worker):
+    """Drenagem do worker: tarefas de fundo, executores e pool de conexões.
+
+    Upload jobs em andamento voltam para 'pending' e são assumidos por outro worker (vigiar_upload_jobs).
+    """
+    from app import encerrar_servicos
+    encerrar_servicos()
@@ -0,0 +1,59 @@
+"""jobs de upload e derivados das fotos
+
+Tabelas dos jobs de upload em lote (upload_job, upload_job_arquivo) e as URLs da miniatura
+e da prévia web de cada foto, que não existiam no schema do antigo db.create_all().
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18 09:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001a'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('foto') as batch_op:
+        batch_op.add_column(sa.Column('thumbnail_url', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('preview_url', sa.String(length=255), nullable=True))
+
+    op.create_table('upload_job',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('evento_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.String(length=30), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=True),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True),
+    sa.Column('finalizado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['evento_id'], ['evento.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('upload_job_arquivo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.String(length=36), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('staged_path', sa.String(length=512), nullable=True),
+    sa.Column('storage_path', sa.String(length=255), nullable=True),
+    sa.Column('tamanho', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('erro', sa.Text(), nullable=True),
+    sa.Column('foto_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['foto_id'], ['foto.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['upload_job.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('upload_job_arquivo')
+    op.drop_table('upload_job')
+    with op.batch_alter_table('foto') as batch_op:
+        batch_op.drop_column('preview_url')
+        batch_op.drop_column('thumbnail_url')
@@ -0,0 +1,43 @@
+"""indices das consultas de galeria, etiquetagem e exclusao de eventos
+
+Índices para os caminhos usados por cliente_galeria, admin_etiquetagem, a API de fotos
+e delete_event. No Postgres são criados com CONCURRENTLY, sem bloquear escritas.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001a'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_foto_evento_id_id', 'foto', ['evento_id', 'id']),
+    ('ix_foto_aluno_association_aluno_id_foto_id', 'foto_aluno_association', ['aluno_id', 'foto_id']),
+    ('ix_turma_evento_id', 'turma', ['evento_id']),
+    ('ix_aluno_turma_id', 'aluno', ['turma_id']),
+    ('ix_aluno_user_id', 'aluno', ['user_id']),
+    ('ix_evento_contrato_id', 'evento', ['contrato_id']),
+    ('ix_upload_job_evento_id', 'upload_job', ['evento_id']),
+    ('ix_upload_job_arquivo_job_id_status', 'upload_job_arquivo', ['job_id', 'status']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""checkpoints do sync incremental
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sync_checkpoint',
+    sa.Column('tabela', sa.String(length=50), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('ultimo_id', sa.String(length=36), nullable=True),
+    sa.Column('linhas_aplicadas', sa.Integer(), nullable=False),
+    sa.Column('sincronizado_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('tabela')
+    )
+
+
+def downgrade():
+    op.drop_table('sync_checkpoint')
@@ -0,0 +1,41 @@
+"""indices do seletor de alunos do contrato
+
+Índices para /api/contratos/<id>/alunos: assinantes por plano, busca por nome (trigram,
+requer a extensão pg_trgm) e por prefixo de CPF. No Postgres são criados com CONCURRENTLY.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_assinatura_plano_id_user_id', 'assinatura', ['plano_id', 'user_id'], {}),
+    ('ix_aluno_nome_trgm', 'aluno', ['nome'], {'postgresql_using': 'gin', 'postgresql_ops': {'nome': 'gin_trgm_ops'}}),
+    ('ix_user_cpf_prefixo', 'user', ['cpf'], {'postgresql_ops': {'cpf': 'text_pattern_ops'}}),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas, opcoes in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True, **opcoes)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,93 @@
+"""colunas normalizadas para a busca de alunos
+
+Adiciona aluno.nome_busca (nome sem acentos e em minúsculas) e user.cpf_busca (somente
+dígitos), preenche as linhas existentes em lotes e troca os índices da 0005 pelos
+equivalentes sobre essas colunas. No Postgres os índices são criados com CONCURRENTLY.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+LOTE = 5000
+
+INDICES_ANTIGOS = [
+    ('ix_aluno_nome_trgm', 'aluno', ['nome'], {'postgresql_using': 'gin', 'postgresql_ops': {'nome': 'gin_trgm_ops'}}),
+    ('ix_user_cpf_prefixo', 'user', ['cpf'], {'postgresql_ops': {'cpf': 'text_pattern_ops'}}),
+]
+
+INDICES = [
+    ('ix_aluno_nome_busca_trgm', 'aluno', ['nome_busca'], {'postgresql_using': 'gin', 'postgresql_ops': {'nome_busca': 'gin_trgm_ops'}}),
+    ('ix_user_cpf_busca', 'user', ['cpf_busca'], {'postgresql_ops': {'cpf_busca': 'text_pattern_ops'}}),
+]
+
+
+# Cópias de normalizar_busca e somente_digitos (app.py) no momento desta migração
+def normalizar_busca(texto):
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ' '.join(''.join(c for c in decomposto if not unicodedata.combining(c)).lower().split())
+
+
+def somente_digitos(texto):
+    return re.sub(r'\D', '', texto or '')
+
+
+def _preencher(tabela, origem, destino, normalizar):
+    bind = op.get_bind()
+    t = sa.table(tabela, sa.column('id', sa.Integer), sa.column(origem, sa.String), sa.column(destino, sa.String))
+    ultimo_id = 0
+    while True:
+        linhas = bind.execute(
+            sa.select(t.c.id, t.c[origem]).where(t.c.id > ultimo_id).order_by(t.c.id).limit(LOTE)
+        ).all()
+        if not linhas:
+            break
+        bind.execute(
+            t.update().where(t.c.id == sa.bindparam('_id')).values({destino: sa.bindparam('_valor')}),
+            [{'_id': id_, '_valor': normalizar(valor)} for id_, valor in linhas]
+        )
+        ultimo_id = linhas[-1].id
+
+
+def upgrade():
+    with op.batch_alter_table('aluno') as batch_op:
+        batch_op.add_column(sa.Column('nome_busca', sa.String(length=100), nullable=True))
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('cpf_busca', sa.String(length=14), nullable=True))
+
+    _preencher('aluno', 'nome', 'nome_busca', normalizar_busca)
+    _preencher('user', 'cpf', 'cpf_busca', somente_digitos)
+
+    # CREATE/DROP INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in INDICES_ANTIGOS:
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
+        for nome, tabela, colunas, opcoes in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True, **opcoes)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
+        for nome, tabela, colunas, opcoes in INDICES_ANTIGOS:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True, **opcoes)
+
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('cpf_busca')
+    with op.batch_alter_table('aluno') as batch_op:
+        batch_op.drop_column('nome_busca')
@@ -0,0 +1,50 @@
+"""etiquetagem automática: status e confiança das etiquetas, cache de embeddings faciais
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Etiquetas existentes são manuais: status 'confirmada' pelo server_default, sem confiança
+    with op.batch_alter_table('foto_aluno_association') as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=10), server_default='confirmada', nullable=False))
+        batch_op.add_column(sa.Column('confianca', sa.Float(), nullable=True))
+
+    op.create_table('embedding_foto',
+    sa.Column('foto_id', sa.Integer(), nullable=False),
+    sa.Column('modelo', sa.String(length=50), nullable=False),
+    sa.Column('faces', sa.Integer(), nullable=False),
+    sa.Column('vetores', sa.LargeBinary(), nullable=False),
+    sa.Column('calculado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['foto_id'], ['foto.id'], ),
+    sa.PrimaryKeyConstraint('foto_id')
+    )
+    op.create_table('embedding_aluno',
+    sa.Column('aluno_id', sa.Integer(), nullable=False),
+    sa.Column('modelo', sa.String(length=50), nullable=False),
+    sa.Column('referencia_url', sa.String(length=255), nullable=False),
+    sa.Column('vetor', sa.LargeBinary(), nullable=True),
+    sa.Column('calculado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['aluno_id'], ['aluno.id'], ),
+    sa.PrimaryKeyConstraint('aluno_id')
+    )
+
+
+def downgrade():
+    op.drop_table('embedding_aluno')
+    op.drop_table('embedding_foto')
+    with op.batch_alter_table('foto_aluno_association') as batch_op:
+        batch_op.drop_column('confianca')
+        batch_op.drop_column('status')
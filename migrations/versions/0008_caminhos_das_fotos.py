@@ -0,0 +1,57 @@
+"""fotos guardam o caminho no storage em vez da URL pública
+
+Renomeia foto.url, foto.thumbnail_url e foto.preview_url para caminho, caminho_thumbnail e
+caminho_preview e remove o prefixo das URLs públicas (STORAGE_PUBLIC_BASE_URL, com o mesmo
+padrão de app.py). Valores com outro prefixo continuam como URLs absolutas.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+COLUNAS = [('url', 'caminho', False), ('thumbnail_url', 'caminho_thumbnail', True), ('preview_url', 'caminho_preview', True)]
+
+
+def prefixo_publico():
+    base = os.getenv(
+        'STORAGE_PUBLIC_BASE_URL',
+        f"{os.getenv('SUPABASE_URL')}/storage/v1/object/public/event_photos"
+    )
+    return f"{base}/"
+
+
+def upgrade():
+    with op.batch_alter_table('foto') as batch_op:
+        for antiga, nova, nullable in COLUNAS:
+            batch_op.alter_column(antiga, new_column_name=nova, existing_type=sa.String(length=255), existing_nullable=nullable)
+
+    prefixo = prefixo_publico()
+    for _, coluna, _ in COLUNAS:
+        op.execute(sa.text(
+            f"UPDATE foto SET {coluna} = substr({coluna}, :inicio) WHERE substr({coluna}, 1, :tamanho) = :prefixo"
+        ).bindparams(inicio=len(prefixo) + 1, tamanho=len(prefixo), prefixo=prefixo))
+
+
+def downgrade():
+    prefixo = prefixo_publico()
+    for _, coluna, _ in COLUNAS:
+        op.execute(sa.text(
+            f"UPDATE foto SET {coluna} = :prefixo || {coluna} WHERE {coluna} NOT LIKE '%://%'"
+        ).bindparams(prefixo=prefixo))
+
+    with op.batch_alter_table('foto') as batch_op:
+        for antiga, nova, nullable in COLUNAS:
+            batch_op.alter_column(nova, new_column_name=antiga, existing_type=sa.String(length=255), existing_nullable=nullable)
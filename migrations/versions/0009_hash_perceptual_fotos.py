@@ -0,0 +1,38 @@
+"""hash perceptual das fotos para a detecção de fotos repetidas no upload
+
+Adiciona foto.phash (dHash de 64 bits) e foto.duplicata_suspeita, com o índice (evento_id, phash)
+criado com CONCURRENTLY no Postgres. Fotos existentes ficam sem hash até o comando
+`flask calcular-hashes-fotos`.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('foto') as batch_op:
+        batch_op.add_column(sa.Column('phash', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('duplicata_suspeita', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index('ix_foto_evento_id_phash', 'foto', ['evento_id', 'phash'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_foto_evento_id_phash', table_name='foto', postgresql_concurrently=True, if_exists=True)
+    with op.batch_alter_table('foto') as batch_op:
+        batch_op.drop_column('duplicata_suspeita')
+        batch_op.drop_column('phash')
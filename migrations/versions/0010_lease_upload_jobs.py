@@ -0,0 +1,31 @@
+"""lease dos upload jobs: worker que executa o job e último heartbeat
+
+Um job em 'processing' sem heartbeat recente (worker reciclado ou morto) volta a ser assumido
+por qualquer worker; jobs existentes começam sem lease.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('upload_job') as batch_op:
+        batch_op.add_column(sa.Column('trabalhador', sa.String(length=36), nullable=True))
+        batch_op.add_column(sa.Column('heartbeat_em', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('upload_job') as batch_op:
+        batch_op.drop_column('heartbeat_em')
+        batch_op.drop_column('trabalhador')
@@ -0,0 +1,26 @@
+"""linhas do sync incremental ignoradas e pendentes de nova tentativa
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sync_checkpoint') as batch_op:
+        batch_op.add_column(sa.Column('pendentes', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('sync_checkpoint') as batch_op:
+        batch_op.drop_column('pendentes')
@@ -0,0 +1,159 @@
+"""Fixtures dos testes de app.py.
+
+app.py é importado uma vez por sessão com um SQLite temporário (schema criado pelas migrações),
+storage local em um diretório temporário e o cliente Supabase substituído por SupabaseStub,
+que roda no próprio processo. Execute a partir da raiz do repositório:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import types
+import uuid
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from stub_supabase import instalar_stub_supabase
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _ConsultaStub:
+    """Consulta PostgREST fictícia sobre as tabelas em memória do SupabaseStub."""
+
+    def __init__(self, cliente, tabela):
+        self._cliente = cliente
+        self._tabela = tabela
+        self._filtros = []
+        self._limite = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def eq(self, coluna, valor):
+        self._filtros.append(lambda linha: linha.get(coluna) == valor)
+        return self
+
+    def in_(self, coluna, valores):
+        valores = set(valores)
+        self._filtros.append(lambda linha: linha.get(coluna) in valores)
+        return self
+
+    def limit(self, limite):
+        self._limite = limite
+        return self
+
+    def execute(self):
+        cliente = self._cliente
+        with cliente.lock:
+            cliente.consultas[self._tabela] += 1
+        cliente.em_consulta.set()
+        cliente.liberar.wait(timeout=10)
+        linhas = [dict(l) for l in cliente.tabelas.get(self._tabela, []) if all(f(l) for f in self._filtros)]
+        if self._limite is not None:
+            linhas = linhas[:self._limite]
+        return types.SimpleNamespace(data=linhas)
+
+
+class SupabaseStub:
+    """Cliente Supabase em processo: tabelas como listas de dicionários e consultas contadas por tabela.
+
+    `liberar` permite segurar as consultas em andamento (ex.: para provocar misses concorrentes);
+    `em_consulta` é sinalizado quando alguma consulta começa.
+    """
+
+    def __init__(self):
+        self.supabase_url = 'http://supabase.testes'
+        self.lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.tabelas = {}
+        self.consultas = Counter()
+        self.em_consulta = threading.Event()
+        self.liberar = threading.Event()
+        self.liberar.set()
+
+    def from_(self, tabela):
+        return _ConsultaStub(self, tabela)
+
+    table = from_
+
+
+_supabase_stub = SupabaseStub()
+
+
+@pytest.fixture(scope='session')
+def m():
+    """O módulo app.py, importado com o banco de testes já migrado."""
+    temporario = tempfile.mkdtemp(prefix='testes-app-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(temporario, 'testes.db')}"
+    os.environ['LOCAL_STORAGE_DIR'] = os.path.join(temporario, 'storage')
+    os.environ.setdefault('SECRET_KEY', 'testes')
+    os.environ.setdefault('SUPABASE_URL', 'http://supabase.testes')
+    os.environ.pop('CACHE_REDIS_URL', None)
+    instalar_stub_supabase(lambda url, key: _supabase_stub)
+
+    sys.path.insert(1, RAIZ)
+    import app as modulo
+    with modulo.app.app_context():
+        modulo.upgrade(directory=os.path.join(RAIZ, 'migrations'))
+    return modulo
+
+
+@pytest.fixture
+def supabase_stub(m):
+    _supabase_stub.reiniciar()
+    yield _supabase_stub
+    _supabase_stub.liberar.set()
+
+
+@pytest.fixture
+def contexto(m):
+    with m.app.app_context():
+        yield
+        m.db.session.remove()
+
+
+@pytest.fixture
+def criar_evento(m, contexto):
+    """Cria um evento com `alunos` filhos do mesmo responsável e `fotos` etiquetadas com `etiquetas_por_foto` alunos cada."""
+
+    def criar(fotos, alunos, etiquetas_por_foto=2):
+        db = m.db
+        sufixo = uuid.uuid4().hex
+        contrato = m.Contrato(id=str(uuid.uuid4()), nome=f'Escola {sufixo[:8]}')
+        evento = m.Evento(id=str(uuid.uuid4()), nome='Formatura', data=date(2026, 1, 1), contrato_id=contrato.id)
+        user = m.User(email=f'{sufixo}@testes.local', password_hash='-', cpf=sufixo[:11])
+        turma = m.Turma(nome='5A', evento_id=evento.id)
+        db.session.add_all([contrato, evento, user, turma])
+        db.session.flush()
+
+        novos_alunos = [m.Aluno(nome=f'Aluno {i}', user_id=user.id, turma_id=turma.id) for i in range(alunos)]
+        db.session.add_all(novos_alunos)
+        db.session.flush()
+        aluno_ids = [aluno.id for aluno in novos_alunos]
+        foto_ids = db.session.scalars(insert(m.Foto).returning(m.Foto.id), [
+            {"caminho": f"{evento.id}/{uuid.uuid4()}.jpg", "evento_id": evento.id} for _ in range(fotos)
+        ]).all() if fotos else []
+        etiquetas = {
+            (foto_id, aluno_ids[(i + j) % len(aluno_ids)])
+            for i, foto_id in enumerate(foto_ids) for j in range(etiquetas_por_foto)
+        }
+        if etiquetas:
+            db.session.execute(insert(m.foto_aluno_association), [
+                {"foto_id": foto_id, "aluno_id": aluno_id} for foto_id, aluno_id in etiquetas
+            ])
+        db.session.commit()
+        return {"evento_id": evento.id, "user_id": user.id, "aluno_ids": aluno_ids, "foto_ids": foto_ids}
+
+    return criar
+
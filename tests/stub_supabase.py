@@ -0,0 +1,26 @@
+"""Substituição do pacote supabase antes de importar app.py, usada pelos testes (conftest.py) e pelos benchmarks."""
+import os
+import sys
+import tempfile
+
+
+def instalar_stub_supabase(create_client):
+    """Faz o `from supabase import create_client` de app.py receber `create_client` (ex.: um cliente em memória).
+
+    Sem o pacote supabase-py instalado, cria um módulo `supabase` em disco, não só em sys.modules:
+    os processos do pool de derivados (forkserver/spawn) importam app.py do zero e também precisam
+    encontrá-lo. Ele vem antes da raiz do repositório no sys.path, onde o diretório supabase/
+    (funções do projeto Supabase) seria importado como um namespace sem create_client.
+    """
+    try:
+        import supabase as supabase_pkg
+        supabase_pkg.create_client
+    except (ImportError, AttributeError):
+        stub_dir = tempfile.mkdtemp(prefix='stub-supabase-')
+        with open(os.path.join(stub_dir, 'supabase.py'), 'w') as arquivo:
+            arquivo.write('def create_client(url, key):\n    raise RuntimeError("Supabase indisponível fora do processo principal")\n')
+        sys.path.insert(0, stub_dir)
+        sys.modules.pop('supabase', None)
+        import supabase as supabase_pkg
+    supabase_pkg.create_client = create_client
+    return supabase_pkg
@@ -0,0 +1,42 @@
+"""Paginação por cursor do seletor de alunos do contrato (/api/contratos/<id>/alunos)."""
+import base64
+import json
+import uuid
+
+import pytest
+
+
+def cursor_de(valor):
+    return base64.urlsafe_b64encode(json.dumps(valor).encode()).decode()
+
+
+@pytest.fixture
+def contrato_id(m, contexto):
+    contrato = m.Contrato(id=str(uuid.uuid4()), nome='Escola')
+    m.db.session.add(contrato)
+    m.db.session.commit()
+    return contrato.id
+
+
+@pytest.mark.parametrize('cursor', [
+    'nao-e-base64!!',
+    base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+    cursor_de({"nome": "Ana", "id": 1}),
+    cursor_de(["Ana"]),
+    cursor_de([1, 2]),
+    cursor_de(["Ana", "2"]),
+    cursor_de(["Ana", 2.5]),
+    cursor_de(["Ana", True]),
+    cursor_de([["Ana"], 2]),
+])
+def test_cursor_invalido_retorna_400(m, contrato_id, cursor):
+    resposta = m.app.test_client().get(f'/api/contratos/{contrato_id}/alunos', query_string={"cursor": cursor})
+
+    assert resposta.status_code == 400
+    assert resposta.get_json() == {"error": "cursor inválido"}
+
+
+def test_cursor_valido_e_aceito(m, contrato_id):
+    resposta = m.app.test_client().get(f'/api/contratos/{contrato_id}/alunos', query_string={"cursor": cursor_de(["Ana", 2])})
+
+    assert resposta.status_code == 200
@@ -0,0 +1,45 @@
+"""Invalidação durante uma busca em andamento no ReadThroughCache (ex.: contract_details)."""
+import threading
+import uuid
+
+
+def test_invalidacao_durante_a_busca_nao_grava_o_valor_antigo(m):
+    versao = {"atual": 'antiga'}
+    busca_iniciada, liberar_busca = threading.Event(), threading.Event()
+
+    def loader(key):
+        valor = {"versao": versao["atual"], "id": key}
+        busca_iniciada.set()
+        liberar_busca.wait(timeout=5)
+        return valor
+
+    cache = m.ReadThroughCache(m.LRUTTLCache(f'testes-{uuid.uuid4()}', 10, 60), loader)
+    tags = lambda valor: [f"contrato:{valor['id']}"]
+    resultados = []
+    leitura = threading.Thread(target=lambda: resultados.append(cache.get('c1', tags)))
+    leitura.start()
+
+    # A escrita acontece (e invalida) enquanto a leitura anterior a ela ainda está em andamento
+    assert busca_iniciada.wait(timeout=5)
+    versao["atual"] = 'nova'
+    cache.invalidate_tag('contrato:c1')
+    liberar_busca.set()
+    leitura.join(timeout=5)
+
+    assert resultados == [{"versao": 'antiga', "id": 'c1'}]
+    assert cache.cache.get('c1') is None
+    assert cache.get('c1', tags)["versao"] == 'nova'
+    assert cache.cache.get('c1')["versao"] == 'nova'
+
+
+def test_detalhes_do_contrato_refletem_o_novo_token(m, contexto):
+    contrato = m.Contrato(id=str(uuid.uuid4()), nome='Escola', token_convite=str(uuid.uuid4()))
+    m.db.session.add(contrato)
+    m.db.session.commit()
+    token_antigo = contrato.token_convite
+    assert m.detalhes_contrato_por_token(token_antigo)
+
+    resposta = m.app.test_client().post(f'/admin/contrato/{contrato.id}/gerar-convite')
+
+    assert resposta.status_code == 200
+    assert m.detalhes_contrato_por_token(token_antigo) is None
@@ -0,0 +1,64 @@
+"""ReadThroughCache dos contratos do Supabase (supabase_contracts) sobre o SupabaseStub."""
+import threading
+import time
+import uuid
+
+
+def contrato_supabase(nome):
+    return {"id": str(uuid.uuid4()), "name": nome, "description": None, "invite_link_id": str(uuid.uuid4())}
+
+
+def test_misses_concorrentes_fazem_uma_unica_busca(m, supabase_stub):
+    contrato = contrato_supabase('Escola')
+    supabase_stub.tabelas['contracts'] = [contrato]
+    supabase_stub.liberar.clear()
+    agrupados_antes = m.supabase_contracts.coalesced
+    resultados = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(m.supabase_contracts.get(contrato['id'])))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Segura a primeira busca até as outras 7 threads estarem esperando por ela
+    assert supabase_stub.em_consulta.wait(timeout=5)
+    limite = time.monotonic() + 5
+    while m.supabase_contracts.coalesced - agrupados_antes < 7 and time.monotonic() < limite:
+        time.sleep(0.01)
+    supabase_stub.liberar.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert supabase_stub.consultas['contracts'] == 1
+    assert resultados == [contrato] * 8
+
+
+def test_entrada_expira_pelo_ttl(m, supabase_stub, monkeypatch):
+    contrato = contrato_supabase('Escola')
+    supabase_stub.tabelas['contracts'] = [contrato]
+    monkeypatch.setattr(m.supabase_contracts.cache, 'ttl', 0.05)
+
+    m.supabase_contracts.get(contrato['id'])
+    m.supabase_contracts.get(contrato['id'])
+    assert supabase_stub.consultas['contracts'] == 1
+
+    time.sleep(0.1)
+    m.supabase_contracts.get(contrato['id'])
+    assert supabase_stub.consultas['contracts'] == 2
+
+
+def test_sync_gallery_event_invalida_o_contrato(m, supabase_stub, contexto):
+    contrato = contrato_supabase('Nome antigo')
+    supabase_stub.tabelas['contracts'] = [contrato]
+    assert m.supabase_contracts.get(contrato['id'])['name'] == 'Nome antigo'
+
+    supabase_stub.tabelas['contracts'] = [dict(contrato, name='Nome novo')]
+    resposta = m.app.test_client().post('/api/sync-gallery-event', json={
+        "id": str(uuid.uuid4()), "name": 'Formatura', "contract_id": contrato['id']
+    })
+
+    assert resposta.status_code == 200, resposta.get_json()
+    assert supabase_stub.consultas['contracts'] == 2
+    assert m.db.session.get(m.Contrato, contrato['id']).nome == 'Nome novo'
+    assert m.supabase_contracts.get(contrato['id'])['name'] == 'Nome novo'
@@ -0,0 +1,37 @@
+"""As páginas da galeria e da etiquetagem executam um número fixo de consultas SQL,
+independente da quantidade de fotos, alunos e etiquetas do evento (sem N+1)."""
+
+
+def consultas(cliente, url):
+    resposta = cliente.get(url)
+    assert resposta.status_code == 200, resposta.data[:200]
+    return int(resposta.headers['X-Query-Count'])
+
+
+def consultas_das_paginas(m, evento):
+    cliente = m.app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['user_id'] = evento['user_id']
+    evento_id = evento['evento_id']
+    return {
+        "cliente_galeria": consultas(cliente, f"/dashboard/evento/{evento_id}"),
+        "admin_etiquetagem": consultas(cliente, f"/admin/evento/{evento_id}/etiquetar"),
+        "fotos_do_evento": consultas(cliente, f"/api/eventos/{evento_id}/fotos?limit=500"),
+    }
+
+
+def test_consultas_constantes_com_10x_fotos_e_etiquetas(m, criar_evento):
+    pequeno = criar_evento(fotos=20, alunos=4)
+    grande = criar_evento(fotos=200, alunos=40)
+
+    assert consultas_das_paginas(m, pequeno) == consultas_das_paginas(m, grande)
+
+
+def test_galeria_grande_traz_todas_as_fotos_etiquetadas(m, criar_evento):
+    grande = criar_evento(fotos=200, alunos=40, etiquetas_por_foto=3)
+    cliente = m.app.test_client()
+
+    fotos = cliente.get(f"/api/eventos/{grande['evento_id']}/fotos?limit=500").get_json()["fotos"]
+
+    assert len(fotos) == 200
+    assert all(len(foto["etiquetados_ids"]) == 3 for foto in fotos)
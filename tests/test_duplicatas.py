@@ -0,0 +1,82 @@
+"""Detecção de fotos quase repetidas no upload (dHash): marcadas por padrão, descartadas com PHOTO_DUPLICATE_ACTION=skip."""
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def imagem(semente, tamanho=(640, 480), qualidade=90):
+    """JPEG com blocos de tons aleatórios (determinísticos pela semente)."""
+    aleatorio = random.Random(semente)
+    original = Image.new('RGB', (16, 12))
+    original.putdata([tuple(aleatorio.randrange(256) for _ in range(3)) for _ in range(16 * 12)])
+    buffer = io.BytesIO()
+    original.resize(tamanho, Image.BILINEAR).save(buffer, 'JPEG', quality=qualidade)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pool_em_threads(m, monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(m, 'get_derivative_pool', lambda: pool)
+    yield
+    pool.shutdown()
+
+
+def enviar(m, evento_id, arquivos):
+    return m.processar_upload_fotos(evento_id, [(nome, io.BytesIO(conteudo), 'image/jpeg') for nome, conteudo in arquivos])
+
+
+def suspeitas(m, evento_id):
+    m.db.session.expire_all()
+    return dict(m.db.session.execute(select(m.Foto.caminho, m.Foto.duplicata_suspeita).where(m.Foto.evento_id == evento_id)).all())
+
+
+def test_hash_resiste_a_recompressao_e_redimensionamento(m):
+    original = m.calcular_hash_perceptual(imagem(1))
+    copia = m.calcular_hash_perceptual(imagem(1, tamanho=(480, 360), qualidade=60))
+    outra = m.calcular_hash_perceptual(imagem(2))
+
+    assert m.distancia_hamming(original, copia) <= m.PHOTO_DUPLICATE_MAX_DISTANCE
+    assert m.distancia_hamming(original, outra) > 10
+    assert -(1 << 63) <= original < (1 << 63) # cabe em BIGINT
+
+
+def test_indice_acha_a_mais_parecida_e_descarta(m):
+    indice = m.IndiceDuplicatas(distancia=2)
+    base = 0x0F0F_0F0F_0F0F_0F0F
+
+    assert indice.registrar(base, {"foto_id": 1}) is None
+    assert indice.registrar(base ^ 0b101, {"filename": 'b.jpg'}) == ({"foto_id": 1}, 2)
+    assert indice.registrar(base ^ 0b111, {"filename": 'c.jpg'}) is None # 3 bits: fora da distância
+    indice.descartar(base, {"foto_id": 1})
+    assert indice.buscar(base) is None
+
+
+def test_quase_repetidas_sao_enviadas_e_marcadas_por_padrao(m, criar_evento, pool_em_threads):
+    assert m.PHOTO_DUPLICATE_ACTION == 'flag'
+    evento_id = criar_evento(fotos=0, alunos=1)['evento_id']
+
+    primeiro = enviar(m, evento_id, [('a.jpg', imagem(1)), ('b.jpg', imagem(2))])
+    segundo = enviar(m, evento_id, [('a-copia.jpg', imagem(1, tamanho=(480, 360), qualidade=60))])
+
+    assert [r["status"] for r in primeiro + segundo] == ['uploaded'] * 3
+    assert not any('possible_duplicate_of' in r for r in primeiro)
+    assert 'foto_id' in segundo[0]["possible_duplicate_of"]
+    assert sorted(suspeitas(m, evento_id).values()) == [False, False, True]
+
+
+def test_com_skip_a_repetida_nao_e_enviada(m, criar_evento, pool_em_threads, monkeypatch):
+    monkeypatch.setattr(m, 'PHOTO_DUPLICATE_ACTION', 'skip')
+    evento_id = criar_evento(fotos=0, alunos=1)['evento_id']
+    enviar(m, evento_id, [('a.jpg', imagem(1))])
+
+    [resultado] = enviar(m, evento_id, [('a-copia.jpg', imagem(1, tamanho=(480, 360), qualidade=60))])
+
+    assert resultado["status"] == 'duplicate'
+    assert 'foto_id' in resultado["duplicate_of"]
+    assert list(suspeitas(m, evento_id).values()) == [False]
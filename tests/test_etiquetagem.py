@@ -0,0 +1,94 @@
+"""Etiquetagem manual (/api/fotos/etiquetar): a diferença calculada no banco e as transições de status."""
+import pytest
+from sqlalchemy import insert, select
+
+
+@pytest.fixture
+def evento(m, criar_evento):
+    return criar_evento(fotos=3, alunos=3, etiquetas_por_foto=0)
+
+
+def etiquetas(m, evento):
+    """{(foto_id, aluno_id): (status, confianca)} das fotos do evento."""
+    tabela = m.foto_aluno_association
+    m.db.session.expire_all()
+    return {
+        (foto_id, aluno_id): (status, confianca)
+        for foto_id, aluno_id, status, confianca in m.db.session.execute(
+            select(tabela.c.foto_id, tabela.c.aluno_id, tabela.c.status, tabela.c.confianca)
+            .where(tabela.c.foto_id.in_(evento['foto_ids']))
+        )
+    }
+
+
+def etiquetar(m, action, foto_ids, aluno_ids):
+    resposta = m.app.test_client().post('/api/fotos/etiquetar', json={"action": action, "foto_ids": foto_ids, "aluno_ids": aluno_ids})
+    assert resposta.status_code == 200, resposta.get_json()
+    return resposta.get_json()
+
+
+def sugerir(m, pares, status='sugerida', confianca=0.9):
+    m.db.session.execute(insert(m.foto_aluno_association), [
+        {"foto_id": foto_id, "aluno_id": aluno_id, "status": status, "confianca": confianca} for foto_id, aluno_id in pares
+    ])
+    m.db.session.commit()
+
+
+def test_adicionar_cria_o_produto_das_fotos_pelos_alunos_uma_vez(m, evento):
+    f1, f2, _ = evento['foto_ids']
+    a1, a2, _ = evento['aluno_ids']
+
+    assert etiquetar(m, 'add', [f1, f2], [a1, a2])["inserted"] == 4
+    assert etiquetar(m, 'add', [f1, f2], [a1, a2, 999999])["inserted"] == 0
+
+    assert etiquetas(m, evento) == {par: ('confirmada', None) for par in [(f1, a1), (f1, a2), (f2, a1), (f2, a2)]}
+
+
+def test_adicionar_confirma_sugestoes_e_rejeicoes_mantendo_a_confianca(m, evento):
+    f1, f2, f3 = evento['foto_ids']
+    a1, _, _ = evento['aluno_ids']
+    sugerir(m, [(f1, a1)])
+    sugerir(m, [(f2, a1)], status='rejeitada', confianca=0.85)
+
+    assert etiquetar(m, 'add', [f1, f2, f3], [a1])["inserted"] == 3
+
+    assert etiquetas(m, evento) == {
+        (f1, a1): ('confirmada', 0.9), (f2, a1): ('confirmada', 0.85), (f3, a1): ('confirmada', None)
+    }
+
+
+def test_remover_apaga_manuais_e_rejeita_as_da_etiquetagem_automatica(m, evento):
+    f1, f2, f3 = evento['foto_ids']
+    a1, a2, _ = evento['aluno_ids']
+    etiquetar(m, 'add', [f1], [a1, a2])
+    sugerir(m, [(f2, a1), (f3, a1)])
+    etiquetar(m, 'add', [f3], [a1]) # sugestão confirmada pelo operador
+
+    assert etiquetar(m, 'remove', [f1, f2, f3], [a1])["deleted"] == 3
+    assert etiquetar(m, 'remove', [f1, f2, f3], [a1])["deleted"] == 0
+
+    # Removidas sem histórico; as da etiquetagem automática ficam rejeitadas para não voltarem como sugestão
+    assert etiquetas(m, evento) == {
+        (f1, a2): ('confirmada', None), (f2, a1): ('rejeitada', 0.9), (f3, a1): ('rejeitada', 0.9)
+    }
+
+
+def test_etiquetar_atualiza_a_galeria_do_cliente_em_cache(m, evento):
+    f1, _, _ = evento['foto_ids']
+    a1, _, _ = evento['aluno_ids']
+    galeria = lambda: m.galeria_do_usuario(evento['evento_id'], evento['user_id'], evento['aluno_ids'])
+
+    assert galeria() == []
+    etiquetar(m, 'add', [f1], [a1])
+    assert [foto["id"] for foto in galeria()] == [f1]
+    etiquetar(m, 'remove', [f1], [a1])
+    assert galeria() == []
+
+
+@pytest.mark.parametrize('corpo', [
+    {"action": 'add', "foto_ids": [], "aluno_ids": [1]},
+    {"action": 'add', "foto_ids": [1], "aluno_ids": []},
+    {"action": 'trocar', "foto_ids": [1], "aluno_ids": [1]},
+])
+def test_dados_invalidos_retornam_400(m, corpo):
+    assert m.app.test_client().post('/api/fotos/etiquetar', json=corpo).status_code == 400
@@ -0,0 +1,95 @@
+"""Exclusão de eventos (/api/delete-event/<id>): instruções em massa no banco e limpeza do storage em lotes."""
+import uuid
+
+import pytest
+from sqlalchemy import func, select, update
+
+
+class BucketFalso:
+    """Bucket que registra as remoções; os lotes em `falhar` levantam erro."""
+
+    def __init__(self, falhar=()):
+        self.removidos = []
+        self.falhar = set(falhar)
+
+    def remove(self, caminhos):
+        self.removidos.append(list(caminhos))
+        if len(self.removidos) in self.falhar:
+            raise RuntimeError('storage indisponível')
+
+
+class ExecutorImediato:
+    def submit(self, funcao, *args):
+        funcao(*args)
+
+
+@pytest.fixture
+def evento_completo(m, criar_evento):
+    """Evento com etiquetas, derivados, embedding e job de upload, mais um segundo evento que não pode ser afetado."""
+    evento = criar_evento(fotos=5, alunos=3)
+    outro = criar_evento(fotos=2, alunos=1)
+    db = m.db
+    db.session.execute(
+        update(m.Foto).where(m.Foto.evento_id == evento['evento_id'])
+        .values(caminho_thumbnail=m.Foto.caminho + '.thumb', caminho_preview=m.Foto.caminho + '.preview')
+    )
+    # Fotos antigas com URL completa não são objetos do nosso bucket
+    db.session.execute(
+        update(m.Foto).where(m.Foto.id == evento['foto_ids'][0]).values(caminho='https://externo/foto.jpg', caminho_thumbnail=None, caminho_preview=None)
+    )
+    db.session.add(m.EmbeddingFoto(foto_id=evento['foto_ids'][1], modelo=m.FACE_MODEL, faces=0, vetores=b''))
+    job = m.UploadJob(id=str(uuid.uuid4()), evento_id=evento['evento_id'], status='completed')
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(m.UploadJobArquivo(job_id=job.id, filename='a.jpg', tamanho=1, status='uploaded', foto_id=evento['foto_ids'][1]))
+    db.session.commit()
+    return evento, outro
+
+
+def contar(m, modelo, *where):
+    return m.db.session.scalar(select(func.count()).select_from(modelo).where(*where))
+
+
+def test_excluir_evento_remove_os_dados_e_retorna_os_caminhos(m, evento_completo):
+    evento, outro = evento_completo
+    tabela = m.foto_aluno_association
+
+    caminhos = m.excluir_evento(evento['evento_id'])
+
+    assert len(caminhos) == 4 * 3 # 4 fotos do bucket x (original, miniatura, prévia)
+    assert not any('://' in caminho for caminho in caminhos)
+    assert m.db.session.get(m.Evento, evento['evento_id']) is None
+    assert contar(m, m.Foto, m.Foto.id.in_(evento['foto_ids'])) == 0
+    assert contar(m, tabela, tabela.c.foto_id.in_(evento['foto_ids'])) == 0
+    assert contar(m, m.EmbeddingFoto, m.EmbeddingFoto.foto_id.in_(evento['foto_ids'])) == 0
+    assert contar(m, m.UploadJob, m.UploadJob.evento_id == evento['evento_id']) == 0
+    assert contar(m, m.Turma, m.Turma.evento_id == evento['evento_id']) == 0
+    # Os alunos continuam cadastrados, só desvinculados da turma excluída
+    assert contar(m, m.Aluno, m.Aluno.id.in_(evento['aluno_ids']), m.Aluno.turma_id.is_(None)) == 3
+
+    assert contar(m, m.Foto, m.Foto.evento_id == outro['evento_id']) == 2
+    assert contar(m, tabela, tabela.c.foto_id.in_(outro['foto_ids'])) == 2
+    assert contar(m, m.Aluno, m.Aluno.id.in_(outro['aluno_ids']), m.Aluno.turma_id.is_not(None)) == 1
+
+
+def test_storage_e_limpo_em_lotes_mesmo_com_falha_em_um_deles(m, monkeypatch):
+    bucket = BucketFalso(falhar={2})
+    monkeypatch.setattr(m, 'get_event_photos_bucket', lambda: bucket)
+    monkeypatch.setattr(m, 'STORAGE_DELETE_BATCH_SIZE', 2)
+
+    m.remover_objetos_do_storage([f'e/{i}.jpg' for i in range(5)])
+
+    assert bucket.removidos == [['e/0.jpg', 'e/1.jpg'], ['e/2.jpg', 'e/3.jpg'], ['e/4.jpg']]
+
+
+def test_delete_event_limpa_o_storage_depois_do_commit(m, evento_completo, monkeypatch):
+    evento, _ = evento_completo
+    bucket = BucketFalso()
+    monkeypatch.setattr(m, 'get_event_photos_bucket', lambda: bucket)
+    monkeypatch.setattr(m, 'background_executor', ExecutorImediato())
+
+    resposta = m.app.test_client().post(f"/api/delete-event/{evento['evento_id']}")
+
+    assert resposta.status_code == 200
+    assert len([caminho for lote in bucket.removidos for caminho in lote]) == 12
+    assert m.app.test_client().post(f"/api/delete-event/{evento['evento_id']}").status_code == 200 # já excluído
@@ -0,0 +1,104 @@
+"""Importação de rosters de famílias (/api/register/bulk)."""
+import io
+import random
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+CABECALHO = 'cpf;email;nome_responsavel;telefone;nome_aluno;data_nascimento;escola;turma;turno'
+
+
+def gerar_cpf():
+    digitos = [random.randrange(10) for _ in range(9)]
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    return ''.join(map(str, digitos))
+
+
+def mascarado(cpf):
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+@pytest.fixture
+def contrato_e_plano(m, contexto):
+    contrato = m.Contrato(id=str(uuid.uuid4()), nome='Escola', token_convite=str(uuid.uuid4()))
+    plano = m.Plano(nome='Plano', preco=100)
+    m.db.session.add_all([contrato, plano])
+    m.db.session.commit()
+    return contrato.token_convite, plano.id
+
+
+@pytest.fixture
+def importar(m, contrato_e_plano):
+    token, plano_id = contrato_e_plano
+
+    def enviar(conteudo, filename='roster.csv'):
+        resposta = m.app.test_client().post('/api/register/bulk', data={
+            "file": (io.BytesIO(conteudo.encode() if isinstance(conteudo, str) else conteudo), filename),
+            "contractSlug": token,
+            "selectedPlan": str(plano_id),
+        }, content_type='multipart/form-data')
+        return resposta.status_code, resposta.get_json()
+
+    return enviar
+
+
+def linha(cpf, email, aluno='Aluno'):
+    return f"{cpf};{email};Responsável;11999999999;{aluno};01/02/2015;Escola;5A;Manhã"
+
+
+def alunos_do_cpf(m, cpf):
+    return m.db.session.scalar(
+        select(func.count()).select_from(m.Aluno).join(m.User).where(m.User.cpf_busca == cpf)
+    )
+
+
+def test_importa_familias_e_reimportacao_e_idempotente(m, importar):
+    cpf = gerar_cpf()
+    roster = '\n'.join([CABECALHO, linha(cpf, f'{cpf}@testes.local', 'Ana'), linha(cpf, f'{cpf}@testes.local', 'Bia')])
+
+    status, relatorio = importar(roster)
+    assert status == 200, relatorio
+    assert (relatorio["familias_importadas"], relatorio["alunos_importados"], relatorio["erros"]) == (1, 2, [])
+
+    status, relatorio = importar(roster)
+    assert (relatorio["familias_importadas"], relatorio["familias_ignoradas"]) == (0, 1)
+    assert alunos_do_cpf(m, cpf) == 2
+
+
+def test_familia_cadastrada_pelo_site_com_cpf_mascarado_e_ignorada(m, importar):
+    cpf = gerar_cpf()
+    m.db.session.add(m.User(email=f'site-{cpf}@testes.local', password_hash='-', cpf=mascarado(cpf)))
+    m.db.session.commit()
+
+    status, relatorio = importar('\n'.join([CABECALHO, linha(cpf, f'outro-{cpf}@testes.local')]))
+
+    assert status == 200, relatorio
+    assert (relatorio["familias_importadas"], relatorio["familias_ignoradas"]) == (0, 1)
+    assert m.db.session.scalar(select(func.count()).select_from(m.User).where(m.User.cpf_busca == cpf)) == 1
+
+
+def test_familia_com_linha_invalida_e_rejeitada_inteira(m, importar):
+    cpf = gerar_cpf()
+    roster = '\n'.join([CABECALHO, linha(cpf, f'{cpf}@testes.local'), linha(cpf, 'sem-arroba')])
+
+    status, relatorio = importar(roster)
+
+    assert status == 200
+    assert relatorio["familias_importadas"] == 0
+    assert [erro["linha"] for erro in relatorio["erros"]] == [3, 2]
+    assert alunos_do_cpf(m, cpf) == 0
+
+
+@pytest.mark.parametrize('conteudo, filename', [
+    (CABECALHO.replace(';', '\t') + '\n' + linha(gerar_cpf(), 'a@testes.local').replace(';', '\t'), 'roster.csv'),
+    ('cpf\n12345678909\n', 'roster.csv'),
+    (b'PK\x03\x04 isto nao e um xlsx', 'roster.xlsx'),
+])
+def test_planilha_ilegivel_retorna_400(importar, conteudo, filename):
+    status, resposta = importar(conteudo, filename)
+
+    assert status == 400
+    assert resposta["error"]
@@ -0,0 +1,83 @@
+"""As consultas quentes da galeria, da etiquetagem e da exclusão de eventos usam os índices das migrações.
+
+Cada teste grava as instruções SQL executadas por uma rota e confere o plano de execução
+(EXPLAIN QUERY PLAN no SQLite, EXPLAIN no PostgreSQL) de cada uma delas.
+"""
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+TABELAS_QUENTES = ('foto', 'foto_aluno_association', 'aluno', 'turma', 'upload_job', 'upload_job_arquivo')
+
+
+@contextmanager
+def instrucoes_executadas(m):
+    instrucoes = []
+
+    def gravar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            instrucoes.append((statement, parameters))
+
+    event.listen(m.db.engine, 'before_cursor_execute', gravar)
+    try:
+        yield instrucoes
+    finally:
+        event.remove(m.db.engine, 'before_cursor_execute', gravar)
+
+
+def planos(m, instrucoes):
+    """Linhas dos planos de execução de todas as instruções."""
+    explain = 'EXPLAIN QUERY PLAN ' if m.db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    linhas = []
+    with m.db.engine.connect() as conn:
+        for statement, parameters in instrucoes:
+            linhas.extend(str(linha[-1]) for linha in conn.exec_driver_sql(explain + statement, parameters))
+    return linhas
+
+
+def assert_usa_indices(linhas, *indices):
+    plano = '\n'.join(linhas)
+    for indice in indices:
+        assert re.search(indice, plano), f"{indice} fora do plano:\n{plano}"
+    varreduras = [l for l in linhas if re.match(rf"(SCAN|Seq Scan on) ({'|'.join(TABELAS_QUENTES)})\b", l.strip())]
+    assert not varreduras, f"varredura completa de tabela:\n{plano}"
+
+
+def test_cliente_galeria_usa_indices(m, criar_evento):
+    evento = criar_evento(fotos=50, alunos=10)
+    cliente = m.app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['user_id'] = evento['user_id']
+
+    with instrucoes_executadas(m) as instrucoes:
+        assert cliente.get(f"/dashboard/evento/{evento['evento_id']}").status_code == 200
+
+    assert_usa_indices(planos(m, instrucoes), 'ix_aluno_user_id', 'ix_foto_aluno_association_aluno_id_foto_id')
+
+
+def test_admin_etiquetagem_usa_indices(m, criar_evento):
+    evento = criar_evento(fotos=50, alunos=10)
+    cliente = m.app.test_client()
+
+    with instrucoes_executadas(m) as instrucoes:
+        assert cliente.get(f"/admin/evento/{evento['evento_id']}/etiquetar").status_code == 200
+        assert cliente.get(f"/api/eventos/{evento['evento_id']}/fotos?limit=20").status_code == 200
+        assert cliente.get(f"/api/eventos/{evento['evento_id']}/fotos?untagged=1").status_code == 200
+
+    # ix_foto_evento_id_id ou ix_foto_evento_id_phash: os dois começam por evento_id
+    assert_usa_indices(planos(m, instrucoes), r'ix_foto_evento_id_(id|phash)')
+
+
+def test_delete_event_usa_indices(m, criar_evento, contexto):
+    evento = criar_evento(fotos=50, alunos=10)
+
+    with instrucoes_executadas(m) as instrucoes:
+        m.excluir_evento(evento['evento_id'])
+
+    assert_usa_indices(
+        planos(m, instrucoes),
+        r'ix_foto_evento_id_(id|phash)', 'ix_turma_evento_id', 'ix_aluno_turma_id',
+        'ix_upload_job_evento_id', 'ix_upload_job_arquivo_job_id_status'
+    )
+    assert m.db.session.get(m.Evento, evento['evento_id']) is None
@@ -0,0 +1,71 @@
+"""Login (/api/login) e verificação de senhas (verify_password)."""
+import hashlib
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def criar_usuario(m, contexto):
+    def criar(password_hash):
+        email = f'{uuid.uuid4().hex}@testes.local'
+        user = m.User(email=email, password_hash=password_hash, cpf=uuid.uuid4().hex[:11])
+        m.db.session.add(user)
+        m.db.session.commit()
+        return user
+    return criar
+
+
+def login(m, email, password):
+    return m.app.test_client().post('/api/login', json={"email": email, "password": password})
+
+
+def test_hash_legado_e_regravado_com_scrypt_no_login(m, criar_usuario):
+    user = criar_usuario(hashlib.sha256(b'senha-antiga').hexdigest())
+
+    assert login(m, user.email, 'senha-antiga').status_code == 200
+
+    m.db.session.refresh(user)
+    assert user.password_hash.startswith('scrypt$')
+    assert m.verify_password('senha-antiga', user.password_hash) == (True, False)
+    assert login(m, user.email, 'senha-antiga').status_code == 200
+
+
+def test_senha_errada_retorna_401_sem_regravar(m, criar_usuario):
+    legado = hashlib.sha256(b'certa').hexdigest()
+    legado_user = criar_usuario(legado)
+    scrypt_user = criar_usuario(m.hash_password('certa'))
+    hash_scrypt = scrypt_user.password_hash
+
+    assert login(m, legado_user.email, 'errada').status_code == 401
+    assert login(m, scrypt_user.email, 'errada').status_code == 401
+
+    m.db.session.refresh(legado_user)
+    m.db.session.refresh(scrypt_user)
+    assert (legado_user.password_hash, scrypt_user.password_hash) == (legado, hash_scrypt)
+
+
+@pytest.mark.parametrize('password_hash', [
+    'scrypt$',
+    'scrypt$16384$8$1$c2FsdA==',
+    'scrypt$dezesseis$8$1$c2FsdA==$ZXNwZXJhZG8=',
+    'scrypt$16384$8$1$nao-e-base64!$ZXNwZXJhZG8=',
+    'scrypt$16383$8$1$c2FsdA==$ZXNwZXJhZG8=', # n precisa ser potência de 2
+    'scrypt$16384$8$1$c2FsdA==$ZXNwZXJhZG8=$extra',
+])
+def test_hash_corrompido_nunca_confere(m, criar_usuario, password_hash):
+    user = criar_usuario(password_hash)
+
+    assert m.verify_password('qualquer', password_hash) == (False, False)
+    assert login(m, user.email, 'qualquer').status_code == 401
+
+
+def test_email_desconhecido_tambem_executa_o_scrypt(m, monkeypatch):
+    conferidos = []
+    verify_password = m.verify_password
+    monkeypatch.setattr(m, 'verify_password', lambda senha, h: conferidos.append(h) or verify_password(senha, h))
+
+    resposta = login(m, 'ninguem@testes.local', 'qualquer')
+
+    assert resposta.status_code == 401
+    assert len(conferidos) == 1 and conferidos[0].startswith('scrypt$')
@@ -0,0 +1,30 @@
+"""Lotes de _processar_imagens_em_lotes: o download do lote seguinte se sobrepõe ao processamento do atual."""
+from concurrent.futures import ThreadPoolExecutor
+
+
+def tamanho(conteudo):
+    return len(conteudo)
+
+
+def test_proximo_lote_e_baixado_antes_de_entregar_o_atual(m, monkeypatch):
+    baixadas = []
+
+    def baixar_imagem(url):
+        baixadas.append(url)
+        if url == 'erro':
+            raise OSError('indisponível')
+        return url.encode()
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(m, 'get_derivative_pool', lambda: pool)
+    monkeypatch.setattr(m, 'baixar_imagem', baixar_imagem)
+    itens = [(i, 'x' * i) for i in range(1, 6)] + [(6, 'erro')]
+
+    lotes = m._processar_imagens_em_lotes(itens, tamanho, tamanho_lote=2)
+
+    assert next(lotes) == [(1, 1), (2, 2)]
+    assert len(baixadas) == 4
+    assert next(lotes) == [(3, 3), (4, 4)]
+    assert len(baixadas) == 6
+    assert list(lotes) == [[(5, 5)]]
+    pool.shutdown()
@@ -0,0 +1,169 @@
+"""Outbox de mensagens: gravação na transação do cadastro, reenvio com backoff e limite de taxa.
+
+O provedor de WhatsApp é substituído por FakeProvedorWhatsApp (httpx.MockTransport), que
+responde no próprio processo com os status configurados pelo teste.
+"""
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import delete, update
+
+
+class FakeProvedorWhatsApp:
+    """Provedor local: grava as requisições recebidas e responde com o status configurado.
+
+    Ordem de precedência: `status_por_telefone`, a fila `respostas` e por fim `status`.
+    """
+
+    def __init__(self):
+        self.recebidas = []
+        self.respostas = []
+        self.status_por_telefone = {}
+        self.status = 200
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        corpo = json.loads(request.content)
+        with self._lock:
+            self.recebidas.append((time.monotonic(), corpo))
+            status = self.status_por_telefone.get(corpo["phone"]) \
+                or (self.respostas.pop(0) if self.respostas else self.status)
+        return httpx.Response(status, json={"ok": status < 400})
+
+
+@pytest.fixture
+def provedor(m, contexto, monkeypatch):
+    fake = FakeProvedorWhatsApp()
+    monkeypatch.setattr(m, '_whatsapp_http_client', httpx.Client(transport=httpx.MockTransport(fake)))
+    m.db.session.execute(delete(m.OutboxMensagem))
+    m.db.session.commit()
+    return fake
+
+
+def enfileirar(m, quantidade=1):
+    mensagens = [m.OutboxMensagem(tipo='whatsapp_boas_vindas', payload=json.dumps({
+        "phone_number": f"1199999{i:04d}", "client_name": 'Ana', "client_dashboard_link": 'http://localhost:3000/client/dashboard'
+    })) for i in range(quantidade)]
+    m.db.session.add_all(mensagens)
+    m.db.session.commit()
+    return [mensagem.id for mensagem in mensagens]
+
+
+def mensagem(m, id_):
+    m.db.session.expire_all()
+    return m.db.session.get(m.OutboxMensagem, id_)
+
+
+def cadastro(token, plano_id):
+    return {
+        "contractSlug": token, "cpf": '529.982.247-25', "parentName": 'Ana Souza', "phone": '11999990000',
+        "parentEmail": f'{uuid.uuid4().hex}@testes.local', "password": 'segredo', "selectedPlan": plano_id,
+        "children": [{"name": 'Bia', "dob": '01/02/2015', "shift": 'Manhã', "school": 'Escola', "class": '5A'}],
+    }
+
+
+def test_mensagem_de_boas_vindas_e_gravada_na_transacao_do_cadastro(m, provedor):
+    contrato = m.Contrato(id=str(uuid.uuid4()), nome='Escola', token_convite=str(uuid.uuid4()))
+    plano = m.Plano(nome='Plano', preco=100)
+    m.db.session.add_all([contrato, plano])
+    m.db.session.commit()
+    cliente = m.app.test_client()
+
+    # Cadastro desfeito (plano inexistente): nenhuma mensagem fica na outbox
+    assert cliente.post('/api/register', json=cadastro(contrato.token_convite, 999999)).status_code == 400
+    assert m.OutboxMensagem.query.count() == 0
+
+    assert cliente.post('/api/register', json=cadastro(contrato.token_convite, plano.id)).status_code == 201
+    [pendente] = m.OutboxMensagem.query.all()
+    assert (pendente.tipo, pendente.status) == ('whatsapp_boas_vindas', 'pending')
+    assert provedor.recebidas == [] # o envio é do dispatcher, não da requisição
+
+    assert m.despachar_lote_outbox() == 1
+    assert mensagem(m, pendente.id).status == 'sent'
+    assert provedor.recebidas[0][1] == {
+        "name": 'Ana', "phone": '11999990000', "clientDashboardLink": 'http://localhost:3000/client/dashboard', "messageType": 'welcome'
+    }
+
+
+def test_falha_temporaria_e_reenviada_com_backoff(m, provedor):
+    [id_] = enfileirar(m)
+    provedor.respostas = [503, 429]
+
+    for tentativas in (1, 2):
+        antes = datetime.utcnow()
+        assert m.despachar_lote_outbox() == 1
+        falha = mensagem(m, id_)
+        assert (falha.status, falha.tentativas) == ('pending', tentativas)
+        atraso = (falha.proxima_tentativa_em - antes).total_seconds()
+        base = m.OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (tentativas - 1)
+        assert base * 0.8 - 1 <= atraso <= base * 1.2 + 1
+        # Antes do backoff vencer a mensagem não é reenviada
+        assert m.despachar_lote_outbox() == 0
+        m.db.session.execute(update(m.OutboxMensagem).values(proxima_tentativa_em=datetime.utcnow() - timedelta(seconds=1)))
+        m.db.session.commit()
+
+    assert m.despachar_lote_outbox() == 1
+    enviada = mensagem(m, id_)
+    assert (enviada.status, enviada.tentativas, enviada.ultimo_erro) == ('sent', 3, None)
+    assert len(provedor.recebidas) == 3
+
+
+def test_rejeicao_do_provedor_e_definitiva(m, provedor):
+    rejeitada, temporaria = enfileirar(m, 2)
+    provedor.status_por_telefone = {"11999990000": 400, "11999990001": 500}
+
+    assert m.despachar_lote_outbox() == 2
+
+    assert (mensagem(m, rejeitada).status, mensagem(m, rejeitada).tentativas) == ('failed', 1)
+    assert mensagem(m, rejeitada).ultimo_erro.startswith('HTTP 400')
+    assert (mensagem(m, temporaria).status, mensagem(m, temporaria).tentativas) == ('pending', 1)
+
+
+def test_limite_de_tentativas_e_definitivo(m, provedor, monkeypatch):
+    [id_] = enfileirar(m)
+    monkeypatch.setattr(m, 'OUTBOX_MAX_TENTATIVAS', 1)
+    provedor.status = 503
+
+    assert m.despachar_lote_outbox() == 1
+
+    esgotada = mensagem(m, id_)
+    assert (esgotada.status, esgotada.tentativas) == ('failed', 1)
+
+
+def test_dispatcher_respeita_a_taxa_de_envio(m, provedor, monkeypatch):
+    monkeypatch.setattr(m, 'outbox_rate_limiter', m.RateLimiter(20))
+    enfileirar(m, 30)
+
+    inicio = time.monotonic()
+    assert m.despachar_lote_outbox() == 30
+
+    # 20 envios imediatos (capacidade do balde) e os outros 10 a 20/s
+    assert time.monotonic() - inicio >= 0.45
+    assert m.OutboxMensagem.query.filter_by(status='sent').count() == 30
+
+
+def test_rate_limiter_abaixo_de_uma_mensagem_por_segundo(m):
+    limiter = m.RateLimiter(0.8)
+    inicio = time.monotonic()
+    concluido = threading.Event()
+
+    def dois_envios():
+        limiter.acquire()
+        limiter.acquire()
+        concluido.set()
+
+    threading.Thread(target=dois_envios, daemon=True).start()
+
+    assert concluido.wait(timeout=5)
+    assert 1.1 <= time.monotonic() - inicio < 2
+
+
+def test_rate_limiter_rejeita_taxa_nao_positiva(m):
+    for taxa in (0, -1):
+        with pytest.raises(ValueError):
+            m.RateLimiter(taxa)
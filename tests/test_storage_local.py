@@ -0,0 +1,32 @@
+"""URLs assinadas do storage local (LOCAL_STORAGE_DIR) servidas por /storage/fotos/<caminho>."""
+import os
+from urllib.parse import urlsplit
+
+import pytest
+
+
+@pytest.fixture
+def foto_local(m):
+    caminho = 'evento-teste/foto.jpg'
+    destino = os.path.join(m.LOCAL_STORAGE_DIR, m.EVENT_PHOTOS_BUCKET, caminho)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, 'wb') as arquivo:
+        arquivo.write(b'jpeg')
+    return caminho
+
+
+def test_url_assinada_serve_a_foto(m, foto_local):
+    url = urlsplit(m.url_foto(foto_local))
+    cliente = m.app.test_client()
+
+    assert cliente.get(f"{url.path}?{url.query}").data == b'jpeg'
+    assert cliente.get(f"{url.path}?{url.query.replace('sig=', 'sig=0')}").status_code == 403
+
+
+def test_sem_secret_key_nao_assina_nem_serve(m, foto_local, monkeypatch):
+    url = urlsplit(m.url_foto(foto_local))
+    monkeypatch.setitem(m.app.config, 'SECRET_KEY', None)
+
+    with pytest.raises(RuntimeError):
+        m._assinatura_storage_local(foto_local, 0)
+    assert m.app.test_client().get(f"{url.path}?{url.query}").status_code == 500
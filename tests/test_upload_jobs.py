@@ -0,0 +1,66 @@
+"""Lease dos upload jobs: um lote só é gravado pelo worker que ainda detém o job."""
+import os
+import uuid
+
+import pytest
+from sqlalchemy import func, select, update
+
+
+@pytest.fixture
+def upload_job(m, criar_evento, tmp_path):
+    evento = criar_evento(fotos=0, alunos=1)
+    job = m.UploadJob(id=str(uuid.uuid4()), evento_id=evento['evento_id'], status='pending')
+    m.db.session.add(job)
+    for i in range(3):
+        staged = tmp_path / f'{i}.jpg'
+        staged.write_bytes(b'jpeg')
+        m.db.session.add(m.UploadJobArquivo(
+            job_id=job.id, filename=f'{i}.jpg', content_type='image/jpeg', staged_path=str(staged),
+            storage_path=f"{evento['evento_id']}/{uuid.uuid4()}.jpg", tamanho=4
+        ))
+    m.db.session.commit()
+    return job.id, evento['evento_id']
+
+
+def fotos_do_evento(m, evento_id):
+    return m.db.session.scalar(select(func.count()).select_from(m.Foto).where(m.Foto.evento_id == evento_id))
+
+
+def test_lote_nao_e_gravado_se_outro_worker_assumiu_o_job(m, upload_job, monkeypatch):
+    job_id, evento_id = upload_job
+    engine = m.db.engine
+
+    def enviar_durante_a_tomada(bucket, duplicatas, filename, staged_path, storage_path, content_type):
+        # O lote passou do lease: outro worker assume o job enquanto este ainda envia os arquivos
+        with engine.begin() as conn:
+            conn.execute(update(m.UploadJob).where(m.UploadJob.id == job_id).values(trabalhador='outro-worker'))
+        return {}, None, None
+
+    monkeypatch.setattr(m, '_enviar_arquivo_staged', enviar_durante_a_tomada)
+    m.executar_upload_job(job_id)
+
+    m.db.session.expire_all()
+    job = m.db.session.get(m.UploadJob, job_id)
+    assert (job.status, job.trabalhador) == ('processing', 'outro-worker')
+    assert fotos_do_evento(m, evento_id) == 0
+    arquivos = m.UploadJobArquivo.query.filter_by(job_id=job_id).all()
+    assert {a.status for a in arquivos} == {'pending'}
+    assert all(os.path.exists(a.staged_path) for a in arquivos)
+
+
+def test_novo_dono_do_job_grava_cada_arquivo_uma_vez(m, upload_job, monkeypatch):
+    job_id, evento_id = upload_job
+    monkeypatch.setattr(m, '_enviar_arquivo_staged', lambda *args: ({}, None, None))
+    # Job abandonado por outro worker (lease vencido)
+    m.db.session.execute(
+        update(m.UploadJob).where(m.UploadJob.id == job_id).values(status='processing', trabalhador='outro-worker', heartbeat_em=None)
+    )
+    m.db.session.commit()
+
+    m.executar_upload_job(job_id)
+
+    m.db.session.expire_all()
+    job = m.db.session.get(m.UploadJob, job_id)
+    assert (job.status, job.trabalhador) == ('completed', None)
+    assert fotos_do_evento(m, evento_id) == 3
+    assert {a.status for a in m.UploadJobArquivo.query.filter_by(job_id=job_id)} == {'uploaded'}
@@ -0,0 +1,5 @@
+# Ponto de entrada WSGI para servidores de um único processo (ex.: waitress-serve wsgi:app).
+# Com gunicorn, use gunicorn.conf.py: as migrações rodam uma vez no master, não em cada worker.
+from app import create_app
+
+app = create_app()